@@ -0,0 +1,22 @@
+-- One-off migration: unique key behind publish_data.py's history INSERT ... ON CONFLICT.
+-- Run once (e.g. psql or the Supabase SQL editor) before deploying the publisher that relies on it.
+-- The key matches HISTORY_SQL's GROUP BY: one log per project/developer per scrape date.
+
+BEGIN;
+
+-- Older publishes could store the same log twice; keep the first copy of each
+DELETE FROM history_logs a
+USING history_logs b
+WHERE a.project_code = b.project_code
+  AND a.project_name = b.project_name
+  AND a.developer_name = b.developer_name
+  AND a.scraped_date = b.scraped_date
+  AND a.ctid > b.ctid;
+
+-- Narrower key created by an earlier publisher build; it would reject rows the wider key allows
+DROP INDEX IF EXISTS history_logs_project_date_key;
+
+CREATE UNIQUE INDEX IF NOT EXISTS history_logs_dedup_key
+    ON history_logs (project_code, project_name, developer_name, scraped_date);
+
+COMMIT;
@@ -1,7 +1,11 @@
 import os
+import io
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import glob
 from datetime import datetime
+from functools import lru_cache
 from sqlalchemy import create_engine, text
 from urllib.parse import quote_plus
 
@@ -13,179 +17,184 @@ DB_PORT = os.getenv("DB_PORT", "6543")
 DB_NAME = os.getenv("DB_NAME", "postgres")
 DATA_DIR = "data"
 
+UNIT_RENAME = {
+    "Kod Projek": "project_code",
+    "Nama Projek": "project_name",
+    "Kod Pemaju & Nama Pemaju": "pemaju_name",
+    "No. Permit": "permit_no",
+    "No Unit": "unit_no",
+    "Harga Jualan (RM)": "price_sales",
+    "Status Jualan": "status",
+    "Kuota Bumi": "bumi_quota",
+    "Scraped_Date": "scraped_date",
+    "Scraped_Timestamp": "scraped_timestamp"
+}
+PROJECT_RENAME = {
+    "Kod Projek": "project_code",
+    "Nama Projek": "project_name",
+    "Kod Pemaju & Nama Pemaju": "pemaju_name",
+    "No. Permit": "permit_no",
+    "Status Projek Keseluruhan": "status_overall",
+    "Maklumat Pembangunan": "development_info",
+    "Daerah Projek": "location_district",
+    "Negeri Projek": "location_state",
+    "Tarikh Sah Laku Permit Terkini": "permit_valid_date",
+    "Scraped_Date": "scraped_date",
+    "Scraped_Timestamp": "scraped_timestamp"
+}
+HOUSE_RENAME = { "Kod Projek": "project_code", "Nama Projek": "project_name", "Jenis Rumah": "house_type", "Bil Tingkat": "num_floors", "Bil Bilik": "num_rooms", "Bil Tandas": "num_bathrooms", "Keluasan Binaan (Mps)": "built_up_size", "Bil.Unit": "total_units", "Harga Minimum (RM)": "price_min", "Harga Maksimum (RM)": "price_max", "Peratus Sebenar %": "percent_actual", "Status Komponen": "component_status", "Tarikh CCC/CFO": "date_ccc_cfo", "Tarikh VP": "date_vp", "Scraped_Date": "scraped_date", "Scraped_Timestamp": "scraped_timestamp" }
+
+# Columns uploaded to each live table (in COPY order)
+UNIT_COLS = ("project_code", "project_name", "pemaju_name", "permit_no", "unit_no", "price_sales", "status", "bumi_quota", "scraped_date", "scraped_timestamp")
+PROJECT_COLS = ("project_code", "project_name", "pemaju_name", "permit_no", "status_overall", "development_info", "location_district", "location_state", "permit_valid_date", "scraped_date", "scraped_timestamp")
+HOUSE_COLS = tuple(HOUSE_RENAME.values())
+
+# units_detail -> history_logs, one row per project/developer per scrape date.
+# Prices like "RM 1,200.00" become 1200; blanks and "-" count as 0.
+# Explicit casts: units_detail.scraped_date may be text, which Postgres won't assign to a date column.
+# The conflict target is the unique index from migrations/001_history_logs_dedup_key.sql.
+HISTORY_SQL = """
+INSERT INTO history_logs (project_code, project_name, developer_name, scraped_date,
+                          total_units, units_sold, units_bumi, sales_value, units_unsold, take_up_rate)
+SELECT project_code, project_name, developer_name, scraped_date::date,
+       total_units::integer, units_sold::integer, units_bumi::integer, sales_value,
+       (total_units - units_sold)::integer,
+       units_sold * 100.0 / NULLIF(total_units, 0)
+FROM (
+    SELECT project_code, project_name, pemaju_name AS developer_name, scraped_date,
+           COUNT(unit_no) AS total_units,
+           COUNT(*) FILTER (WHERE is_sold) AS units_sold,
+           COUNT(*) FILTER (WHERE lower(btrim(bumi_quota::text)) = 'ya') AS units_bumi,
+           COALESCE(SUM(price) FILTER (WHERE is_sold), 0) AS sales_value
+    FROM (
+        SELECT u.*,
+               COALESCE(status::text ILIKE '%telah dijual%', false) AS is_sold,
+               CASE WHEN p.cleaned ~ '^-?[0-9]+([.][0-9]+)?$' THEN p.cleaned::numeric ELSE 0 END AS price
+        FROM units_detail u
+        CROSS JOIN LATERAL (SELECT btrim(replace(replace(u.price_sales::text, 'RM', ''), ',', '')) AS cleaned) p
+    ) units
+    WHERE project_code IS NOT NULL AND project_name IS NOT NULL
+      AND pemaju_name IS NOT NULL AND scraped_date IS NOT NULL
+    GROUP BY project_code, project_name, pemaju_name, scraped_date
+) agg
+ON CONFLICT (project_code, project_name, developer_name, scraped_date) DO NOTHING;
+"""
+
+# Rows per Arrow batch when streaming a daily file into COPY
+BATCH_ROWS = 200_000
+
+CATEGORY_RENAMES = {"UNIT_DETAILS": UNIT_RENAME, "ALL_PROJECTS": PROJECT_RENAME, "HOUSE_TYPE": HOUSE_RENAME}
+CATEGORY_LABELS = {"UNIT_DETAILS": "Units", "ALL_PROJECTS": "Master", "HOUSE_TYPE": "House Types"}
+
+@lru_cache(maxsize=None)
 def get_engine():
     password = quote_plus(DB_PASS)
     url = f"postgresql+psycopg2://{DB_USER}:{password}@{DB_HOST}:{DB_PORT}/{DB_NAME}?sslmode=require"
-    return create_engine(url)
+    # Any executemany that doesn't go through COPY is sent as paged multi-VALUES batches
+    return create_engine(
+        url,
+        executemany_mode="values_plus_batch",
+        insertmanyvalues_page_size=10_000,
+        pool_pre_ping=True,
+    )
 
-def clean_money(val):
+def copy_buffer(conn, table, columns, buf):
+    # COPY ... FROM STDIN is far cheaper than to_sql's row-by-row INSERTs.
+    # Runs on the caller's transaction so it commits/rolls back with it.
+    buf.seek(0)
+    cur = conn.connection.cursor()
     try:
-        if pd.isna(val): return 0.0
-        s = str(val).replace("RM", "").replace(",", "").strip()
-        return float(s)
-    except:
-        return 0.0
+        cur.copy_expert(
+            f"COPY {table} ({','.join(columns)}) FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N')",
+            buf,
+        )
+    finally:
+        cur.close()
+
+def bulk_copy(conn, table, df, columns):
+    buf = io.StringIO()
+    df[columns].to_csv(buf, sep="\t", header=False, index=False, na_rep="\\N")
+    copy_buffer(conn, table, columns, buf)
+
+def find_daily_files(category, today_str):
+    # Scraper names files <PEMAJU>_MELAKA_<CATEGORY>_<YYYYMMDD>.parquet
+    pattern = os.path.join(DATA_DIR, "**", f"*_MELAKA_{category}_{today_str}.parquet")
+    return sorted(glob.glob(pattern, recursive=True))
+
+def open_daily_files(category, today_str):
+    # Opening only reads the footer; unreadable files are skipped up front,
+    # before anything has been written to the live tables.
+    handles = []
+    for full_path in find_daily_files(category, today_str):
+        file = os.path.basename(full_path)
+        try:
+            print(f"   Found {CATEGORY_LABELS[category]}: {file}")
+            handles.append(pq.ParquetFile(full_path))
+        except Exception as e:
+            print(f"⚠️ Error processing {file}: {e}")
+    return handles
+
+def iter_daily_batches(parquet_file, rename_map):
+    # Bounded batches keep peak memory flat however large one pemaju's file is
+    for batch in parquet_file.iter_batches(batch_size=BATCH_ROWS, columns=list(rename_map)):
+        tbl = pa.Table.from_batches([batch])
+        tbl = tbl.rename_columns([rename_map.get(n, n) for n in tbl.column_names])
+        yield tbl.to_pandas(types_mapper=pd.ArrowDtype)
+
+def copy_daily_files(conn, category, files, table, columns):
+    rename_map = CATEGORY_RENAMES[category]
+    rows = 0
+    for pf in files:
+        for df in iter_daily_batches(pf, rename_map):
+            bulk_copy(conn, table, df, [c for c in columns if c in df.columns])
+            rows += len(df)
+    return rows
 
 def process_and_upload():
     print("🚀 Starting Publisher...")
     today_str = datetime.now().strftime("%Y%m%d") 
     print(f"📅 Looking for files dated: {today_str}")
 
-    engine = get_engine()
-    all_units, all_projects, all_houses = [], [], []
-    files_found = 0
-
-    for root, dirs, files in os.walk(DATA_DIR):
-        for file in files:
-            if today_str not in file: continue
-            
-            full_path = os.path.join(root, file)
-            files_found += 1
-            
-            try:
-                # --- A. UNIT DETAILS ---
-                if "_MELAKA_UNIT_DETAILS_" in file:
-                    print(f"   Found Units: {file}")
-                    df = pd.read_csv(full_path)
-                    if df.empty: continue
-                    
-                    df = df.rename(columns={
-                        "Kod Projek & Nama Projek": "project_name_raw",
-                        "Kod Pemaju & Nama Pemaju": "pemaju_name",
-                        "No. Permit": "permit_no",
-                        "No Unit": "unit_no",
-                        "Harga Jualan (RM)": "price_sales",
-                        "Status Jualan": "status",
-                        "Kuota Bumi": "bumi_quota",
-                        "Scraped_Date": "scraped_date",
-                        "Scraped_Timestamp": "scraped_timestamp"
-                    })
-
-                    # SAFE SPLIT LOGIC
-                    if "project_name_raw" in df.columns:
-                        # Ensure string type and handle NaNs
-                        df["project_name_raw"] = df["project_name_raw"].astype(str)
-                        # Split safely
-                        split_data = df["project_name_raw"].str.split(n=1, expand=True)
-                        
-                        if split_data.shape[1] >= 2:
-                            df["project_code"] = split_data[0]
-                            df["project_name"] = split_data[1]
-                        elif split_data.shape[1] == 1:
-                            df["project_code"] = split_data[0]
-                            df["project_name"] = ""
-                        else:
-                            df["project_code"] = df["project_name_raw"]
-                            df["project_name"] = ""
-                            
-                    all_units.append(df)
-
-                # --- B. PROJECTS MASTER ---
-                elif "_MELAKA_ALL_PROJECTS_" in file:
-                    print(f"   Found Master: {file}")
-                    df = pd.read_csv(full_path)
-                    if df.empty: continue
-
-                    df = df.rename(columns={
-                        "Kod Projek & Nama Projek": "project_name_raw",
-                        "Kod Pemaju & Nama Pemaju": "pemaju_name",
-                        "No. Permit": "permit_no",
-                        "Status Projek Keseluruhan": "status_overall",
-                        "Maklumat Pembangunan": "development_info",
-                        "Daerah Projek": "location_district",
-                        "Negeri Projek": "location_state",
-                        "Tarikh Sah Laku Permit Terkini": "permit_valid_date",
-                        "Scraped_Date": "scraped_date",
-                        "Scraped_Timestamp": "scraped_timestamp"
-                    })
-                    
-                    if "project_name_raw" in df.columns:
-                        df["project_name_raw"] = df["project_name_raw"].astype(str)
-                        split_data = df["project_name_raw"].str.split(n=1, expand=True)
-                        if split_data.shape[1] >= 2:
-                            df["project_code"] = split_data[0]
-                            df["project_name"] = split_data[1]
-                        else:
-                            df["project_code"] = df["project_name_raw"]
-                            df["project_name"] = ""
-
-                    all_projects.append(df)
-
-                # --- C. HOUSE TYPES ---
-                elif "_MELAKA_HOUSE_TYPE_" in file:
-                    print(f"   Found House Types: {file}")
-                    df = pd.read_csv(full_path)
-                    if not df.empty: all_houses.append(df)
-
-            except Exception as e:
-                print(f"⚠️ Error processing {file}: {e}")
+    unit_files = open_daily_files("UNIT_DETAILS", today_str)
+    project_files = open_daily_files("ALL_PROJECTS", today_str)
+    house_files = open_daily_files("HOUSE_TYPE", today_str)
+    files_found = len(unit_files) + len(project_files) + len(house_files)
 
     if files_found == 0:
         print(f"⚠️ No files found for {today_str}. Scraper might not have run yet.")
         return
 
-    # Combine
-    df_units_final = pd.concat(all_units, ignore_index=True) if all_units else pd.DataFrame()
-    df_projects_final = pd.concat(all_projects, ignore_index=True) if all_projects else pd.DataFrame()
-    df_houses_final = pd.concat(all_houses, ignore_index=True) if all_houses else pd.DataFrame()
-
-    if df_units_final.empty:
+    # Row counts come from the Parquet footers, so this check reads no data
+    if sum(pf.metadata.num_rows for pf in unit_files) == 0:
         print("⚠️ No unit data to upload.")
         return
 
-    # UPLOAD
+    # Only touch the database once there is something to publish
+    engine = get_engine()
+
+    # UPLOAD (single transaction: truncate + stream COPY into all tables, commit once)
     print("🔄 Updating Live Tables...")
     with engine.begin() as conn:
         conn.execute(text("TRUNCATE TABLE units_detail RESTART IDENTITY;"))
         conn.execute(text("TRUNCATE TABLE projects_master RESTART IDENTITY;"))
         conn.execute(text("TRUNCATE TABLE house_types RESTART IDENTITY;"))
-    
-    # (Upload logic same as before, simplified for brevity...)
-    valid_unit_cols = ["project_code", "project_name", "pemaju_name", "permit_no", "unit_no", "price_sales", "status", "bumi_quota", "scraped_date", "scraped_timestamp"]
-    df_units_final[[c for c in valid_unit_cols if c in df_units_final.columns]].to_sql("units_detail", engine, if_exists="append", index=False)
-    print("   -> Uploaded Units")
-
-    if not df_projects_final.empty:
-        valid_proj_cols = ["project_code", "project_name", "pemaju_name", "permit_no", "status_overall", "development_info", "location_district", "location_state", "permit_valid_date", "scraped_date", "scraped_timestamp"]
-        df_projects_final[[c for c in valid_proj_cols if c in df_projects_final.columns]].to_sql("projects_master", engine, if_exists="append", index=False)
-        print("   -> Uploaded Projects")
-
-    if not df_houses_final.empty:
-        rename_house = { "Kod Projek": "project_code", "Nama Projek": "project_name", "Jenis Rumah": "house_type", "Bil Tingkat": "num_floors", "Bil Bilik": "num_rooms", "Bil Tandas": "num_bathrooms", "Keluasan Binaan (Mps)": "built_up_size", "Bil.Unit": "total_units", "Harga Minimum (RM)": "price_min", "Harga Maksimum (RM)": "price_max", "Peratus Sebenar %": "percent_actual", "Status Komponen": "component_status", "Tarikh CCC/CFO": "date_ccc_cfo", "Tarikh VP": "date_vp", "Scraped_Date": "scraped_date", "Scraped_Timestamp": "scraped_timestamp" }
-        df_houses_final = df_houses_final.rename(columns=rename_house)
-        df_houses_final[[c for c in rename_house.values() if c in df_houses_final.columns]].to_sql("house_types", engine, if_exists="append", index=False)
-        print("   -> Uploaded House Types")
-
-    # HISTORY LOGS
-    print("📈 Generating History Logs...")
-    df_calc = df_units_final.copy()
-    df_calc["is_sold"] = df_calc["status"].astype(str).str.lower().str.contains("telah dijual")
-    df_calc["is_bumi"] = df_calc["bumi_quota"].astype(str).str.lower().str.strip() == "ya"
-    df_calc["price"] = df_calc["price_sales"].apply(clean_money)
-
-    history_df = df_calc.groupby(["project_code", "project_name", "pemaju_name", "scraped_date"], as_index=False).agg(
-        total_units=("unit_no", "count"),
-        units_sold=("is_sold", "sum"),
-        units_bumi=("is_bumi", "sum"),
-        sales_value=("price", lambda x: x[df_calc.loc[x.index, "is_sold"]].sum())
-    )
-    
-    history_df["units_unsold"] = history_df["total_units"] - history_df["units_sold"]
-    history_df["take_up_rate"] = (history_df["units_sold"] / history_df["total_units"]) * 100
-    history_df = history_df.rename(columns={"pemaju_name": "developer_name"})
-
-    # Deduplicate
-    existing_logs = pd.read_sql("SELECT project_code, scraped_date FROM history_logs", engine)
-    if not existing_logs.empty and not history_df.empty:
-        history_df["_key"] = history_df["project_code"].astype(str) + "_" + history_df["scraped_date"].astype(str)
-        existing_logs["_key"] = existing_logs["project_code"].astype(str) + "_" + existing_logs["scraped_date"].astype(str)
-        history_df = history_df[~history_df["_key"].isin(existing_logs["_key"])].drop(columns=["_key"])
-
-    if not history_df.empty:
-        history_df.to_sql("history_logs", engine, if_exists="append", index=False)
-        print(f"   -> Added {len(history_df)} new logs")
-    else:
-        print("   -> No new history logs to add.")
+
+        copy_daily_files(conn, "UNIT_DETAILS", unit_files, "units_detail", UNIT_COLS)
+        print("   -> Uploaded Units")
+
+        if copy_daily_files(conn, "ALL_PROJECTS", project_files, "projects_master", PROJECT_COLS):
+            print("   -> Uploaded Projects")
+
+        if copy_daily_files(conn, "HOUSE_TYPE", house_files, "house_types", HOUSE_COLS):
+            print("   -> Uploaded House Types")
+
+        # HISTORY LOGS (aggregated in Postgres from the units just loaded; the unique key skips known logs)
+        print("📈 Generating History Logs...")
+        result = conn.execute(text(HISTORY_SQL))
+        if result.rowcount:
+            print(f"   -> Added {result.rowcount} new logs")
+        else:
+            print("   -> No new history logs to add.")
 
     print("✅ Done!")
 
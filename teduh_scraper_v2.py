@@ -1,12 +1,16 @@
 import os
 import re
 import time
-import csv
 import glob  # <--- NEW IMPORT ADDED
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
@@ -41,24 +45,39 @@ CONFIG = {
     # Input list
     "PEMAJU_LIST_TXT": "pemaju_list.txt",
 
+    # Parallel pemaju scrapes (each worker process runs its own Chrome)
+    "WORKERS": 2,
+
+    # Buffered rows per Parquet write; each write becomes one row group in the output file
+    "PARQUET_FLUSH_ROWS": 5000,
+
+    # Pinned chromedriver binary; leave blank (or point at a missing file) to use webdriver-manager
+    "CHROMEDRIVER_PATH": "",
+
     # Output Root (Save directly to the main folder)
     "ROOT_DIR": ".",
 }
 
-NOW = datetime.now()
-SCRAPE_DATE = NOW.strftime("%Y-%m-%d")
-SCRAPE_TIMESTAMP = NOW.strftime("%Y-%m-%d %H:%M:%S")
-DATE_SUFFIX = NOW.strftime("%Y%m%d")
-TIME_SUFFIX = NOW.strftime("%Y%m%d_%H%M%S")
+def set_run_time(now):
+    # Also run by the worker initializer: every process stamps rows/files with the parent's run time
+    global NOW, SCRAPE_DATE, SCRAPE_TIMESTAMP, DATE_SUFFIX, TIME_SUFFIX
+    NOW = now
+    SCRAPE_DATE = NOW.strftime("%Y-%m-%d")
+    SCRAPE_TIMESTAMP = NOW.strftime("%Y-%m-%d %H:%M:%S")
+    DATE_SUFFIX = NOW.strftime("%Y%m%d")
+    TIME_SUFFIX = NOW.strftime("%Y%m%d_%H%M%S")
+
+set_run_time(datetime.now())
 
 
 # =========================================================
 # OUTPUT SCHEMAS (LOCKED ORDER)
 # =========================================================
-# ✅ Master CSV DOES NOT include the house-type table columns
+# ✅ Master file DOES NOT include the house-type table columns
 PROJECT_MASTER_HEADERS = [
     "Bil",
-    "Kod Projek & Nama Projek",
+    "Kod Projek",
+    "Nama Projek",
     "Kod Pemaju & Nama Pemaju",
     "No. Permit",
     "Status Projek Keseluruhan",
@@ -71,7 +90,7 @@ PROJECT_MASTER_HEADERS = [
     "Scraped_Timestamp",
 ]
 
-# ✅ House type CSV: follow the schema you wanted
+# ✅ House type file: follow the schema you wanted
 HOUSE_TYPE_HEADERS = [
     "Kod Projek",
     "Nama Projek",
@@ -93,7 +112,8 @@ HOUSE_TYPE_HEADERS = [
 
 UNIT_DETAILS_HEADERS = [
     "Bil",
-    "Kod Projek & Nama Projek",
+    "Kod Projek",
+    "Nama Projek",
     "Kod Pemaju & Nama Pemaju",
     "No. Permit",
 
@@ -108,6 +128,15 @@ UNIT_DETAILS_HEADERS = [
     "Scraped_Timestamp",
 ]
 
+_WS_RE = re.compile(r"\s+")
+_SANI_RE = re.compile(r"[<>:\"/\\|?*]+")
+# Both Status Terkini labels in one pass; each value stops at the next known label (or end)
+_STATUS_RE = re.compile(
+    r"(Maklumat\s*Pembangunan|Status\s*Keseluruhan)\s*:\s*(.*?)"
+    r"(?=Maklumat\s*Pembangunan\s*:|Status\s*Keseluruhan\s*:|Status\s*komponen|Jenis\s*Rumah|$)",
+    re.IGNORECASE,
+)
+
 
 # =========================================================
 # SMALL HELPERS
@@ -118,24 +147,23 @@ def info(msg): logging.info(f"ℹ️ {msg}")
 
 def sanitize_filename(s: str) -> str:
     s = (s or "").strip()
-    s = re.sub(r"[<>:\"/\\|?*]+", "_", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _SANI_RE.sub("_", s)
+    s = _WS_RE.sub(" ", s).strip()
     return s[:80] if s else "UNKNOWN"
 
 def normalize_space(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "")).strip()
+    return _WS_RE.sub(" ", (s or "")).strip()
 
 def ensure_dir(p: str):
     os.makedirs(p, exist_ok=True)
 
 def safe_click(driver, element):
+    # No fixed sleeps here: callers wait on the specific condition the click should cause
     try:
         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-        time.sleep(CONFIG["DELAY_CLICK"] / 2)
         element.click()
     except ElementClickInterceptedException:
         driver.execute_script("arguments[0].click();", element)
-    time.sleep(CONFIG["DELAY_CLICK"])
 
 def wait_clickable(driver, locator, timeout=None):
     timeout = timeout or CONFIG["MAX_WAIT_SECONDS"]
@@ -145,22 +173,67 @@ def wait_visible(driver, locator, timeout=None):
     timeout = timeout or CONFIG["MAX_WAIT_SECONDS"]
     return WebDriverWait(driver, timeout).until(EC.visibility_of_element_located(locator))
 
+def first_row_text(driver):
+    return driver.execute_script("const r = document.querySelector('table tbody tr'); return r ? r.textContent : null;")
+
+def wait_listing_changed(driver, old_text, timeout=15):
+    # Compares text, not nodes, so it works whether the table replaces its rows or patches them in place
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.25).until(
+            lambda d: first_row_text(d) not in (None, old_text)
+        )
+        return True
+    except TimeoutException:
+        return False
+
 
 # =========================================================
 # DRIVER
 # =========================================================
+_CHROMEDRIVER_PATH = None
+
+def resolve_chromedriver_path():
+    # Pinned binary if present, else webdriver-manager (downloads into ~/.wdm on a fresh runner)
+    pinned = CONFIG.get("CHROMEDRIVER_PATH") or ""
+    return pinned if os.path.isfile(pinned) else ChromeDriverManager().install()
+
+def init_worker(now, chromedriver_path):
+    # Pool initializer: share the parent's run time and its already-resolved chromedriver,
+    # so workers never race each other downloading into the same ~/.wdm path
+    global _CHROMEDRIVER_PATH
+    set_run_time(now)
+    _CHROMEDRIVER_PATH = chromedriver_path
+
 def init_driver():
+    global _CHROMEDRIVER_PATH
     chrome_options = Options()
 
     if CONFIG.get("HEADLESS", False):
         chrome_options.add_argument("--headless=new")
         chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-gpu")
 
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_argument("--start-maximized")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-extensions")
+    # Scraping profile: no background services, sync, translate or audio
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--disable-translate")
+    chrome_options.add_argument("--metrics-recording-only")
+    chrome_options.add_argument("--mute-audio")
+    chrome_options.add_argument("--no-first-run")
+    chrome_options.add_argument("--disable-features=Translate,BackForwardCache,AcceptCHFrame")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+
+    # Return from driver.get at DOMContentLoaded; every step waits on its own element anyway
+    chrome_options.page_load_strategy = "eager"
+    # Skip images and notifications. Stylesheets stay on: the visibility waits need the page CSS
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
 
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option("useAutomationExtension", False)
@@ -171,7 +244,10 @@ def init_driver():
         "Chrome/143.0.0.0 Safari/537.36"
     )
 
-    service = Service(ChromeDriverManager().install())
+    # Resolved once (in main() for pool workers); restarts reuse the path without another network check
+    if _CHROMEDRIVER_PATH is None:
+        _CHROMEDRIVER_PATH = resolve_chromedriver_path()
+    service = Service(executable_path=_CHROMEDRIVER_PATH)
     driver = webdriver.Chrome(service=service, options=chrome_options)
     driver.set_page_load_timeout(60)
 
@@ -208,7 +284,6 @@ def setup_logging_for_pemaju(log_dir: str, pemaju_key: str):
 # =========================================================
 def perform_search(driver, keyword: str):
     driver.get(CONFIG["BASE_URL"])
-    time.sleep(CONFIG["DELAY_PAGE_LOAD"])
     ok(f"Opened {CONFIG['BASE_URL']}")
 
     # Jenis Carian
@@ -229,44 +304,33 @@ def perform_search(driver, keyword: str):
     inp = wait_clickable(driver, (By.XPATH, "//input[@placeholder='Kata Kunci' or @type='text']"))
     inp.clear()
     inp.send_keys(keyword)
-    time.sleep(CONFIG["DELAY_CLICK"])
     ok(f"Kata Kunci = {keyword}")
 
     # Cari
     btn = wait_clickable(driver, (By.XPATH, "//button[contains(@class,'btn-search') or contains(.,'Cari') or contains(.,'CARI')]"))
+    old_text = first_row_text(driver)
     safe_click(driver, btn)
+    if old_text is not None and not wait_listing_changed(driver, old_text):
+        info("Listing did not change after Cari; verifying anyway")
     ok("Clicked CARI - Waiting for Robust Verification...")
 
     # --- START ROBUST WAIT LOGIC ---
-    # We loop up to 10 times to check if the first row actually contains our keyword.
-    max_retries = 10
-    found_match = False
-
-    for attempt in range(max_retries):
-        time.sleep(2.0) # Wait for page refresh
+    # Poll until the first row actually contains our keyword (an old result can linger briefly)
+    target_text = keyword.upper().strip()
 
-        try:
-            # 1. Grab the table
-            table = driver.find_element(By.XPATH, "//table[.//tbody//tr]")
-            
-            # 2. Grab the first row
-            first_row = table.find_element(By.XPATH, ".//tbody//tr[1]")
-            
-            # 3. Check text match (Case Insensitive)
-            row_text = first_row.text.upper().strip()
-            target_text = keyword.upper().strip()
+    def _match(d):
+        first_row = d.find_element(By.XPATH, "//table[.//tbody//tr]//tbody//tr[1]")
+        return target_text in first_row.text.upper()
 
-            if target_text in row_text:
-                ok(f"✅ VERIFIED: Search result matches '{keyword}'")
-                found_match = True
-                break
-            else:
-                # If we see a row but it's not our developer, it might be the OLD result
-                info(f"⏳ Attempt {attempt+1}: Scraper saw '{row_text[:30]}...' (Waiting for '{keyword}')")
-        
-        except Exception:
-            # Table might be loading, detached, or empty
-            info(f"⏳ Attempt {attempt+1}: Waiting for results table...")
+    try:
+        WebDriverWait(
+            driver, 20, poll_frequency=0.25,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException),
+        ).until(_match)
+        ok(f"✅ VERIFIED: Search result matches '{keyword}'")
+        found_match = True
+    except TimeoutException:
+        found_match = False
 
     if not found_match:
         fail(f"⚠️ WARNING: Time out waiting for '{keyword}'. The scraper will try to process whatever is there.")
@@ -278,37 +342,54 @@ def perform_search(driver, keyword: str):
 # =========================================================
 # LISTING TABLE + PAGINATION
 # =========================================================
+def scrape_table_fast(driver, table_css, ncols):
+    # One execute_script returns every row's cell text, instead of one WebDriver call per cell
+    rows = driver.execute_script(
+        "const t=document.querySelector(arguments[0]);"
+        "if(!t) return [];"
+        "return [...t.querySelectorAll('tbody tr')].map(r=>[...r.querySelectorAll('td')].slice(0,arguments[1]).map(td=>td.textContent.trim()));",
+        table_css, ncols,
+    )
+    return [[normalize_space(c) for c in r] for r in (rows or [])]
+
 def get_listing_rows(driver):
     table = wait_visible(driver, (By.XPATH, "//table[.//tbody//tr]"))
     return table.find_elements(By.XPATH, ".//tbody//tr")
 
+_NEXT_XPATHS = [
+    "//button[contains(@class,'page-btn')][.//i[contains(@class,'pi-chevron-right')]]",
+    "//button[.//i[contains(@class,'pi-chevron-right')]]",
+]
+_NEXT_XPATH = None  # whichever of _NEXT_XPATHS matched last
+
 def get_next_page_button(driver):
-    xps = [
-        "//button[contains(@class,'page-btn')][.//i[contains(@class,'pi-chevron-right')]]",
-        "//button[.//i[contains(@class,'pi-chevron-right')]]",
-    ]
-    for xp in xps:
-        try:
-            return driver.find_element(By.XPATH, xp)
-        except Exception:
-            continue
+    global _NEXT_XPATH
+    if _NEXT_XPATH:
+        els = driver.find_elements(By.XPATH, _NEXT_XPATH)
+        if els:
+            return els[0]
+    for xp in _NEXT_XPATHS:
+        els = driver.find_elements(By.XPATH, xp)
+        if els:
+            _NEXT_XPATH = xp
+            return els[0]
     return None
 
-def has_next_page(driver):
+def paginate(driver):
+    # One button lookup per page: returns False when there is no enabled Next button
     btn = get_next_page_button(driver)
     if not btn:
         return False
     disabled_attr = (btn.get_attribute("disabled") or "").strip()
     class_attr = (btn.get_attribute("class") or "").lower()
-    return not (disabled_attr or ("disabled" in class_attr))
-
-def click_next_page(driver):
-    btn = get_next_page_button(driver)
-    if not btn:
-        raise Exception("Next page button not found")
+    if disabled_attr or ("disabled" in class_attr):
+        return False
+    old_text = first_row_text(driver)
     safe_click(driver, btn)
-    time.sleep(CONFIG["DELAY_PAGE_LOAD"])
+    if old_text is not None and not wait_listing_changed(driver, old_text):
+        info("Listing did not re-render after Next; continuing")
     ok("Next page clicked")
+    return True
 
 
 # =========================================================
@@ -335,9 +416,19 @@ def close_project_detail(driver):
 # FIELD EXTRACTION
 # =========================================================
 def click_side_tab(driver, tab_text_lower: str):
-    xp = f"//span[contains(translate(normalize-space(.),'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'{tab_text_lower}')]/ancestor::*[self::button or self::a][1]"
-    tab = wait_clickable(driver, (By.XPATH, xp), timeout=12)
-    safe_click(driver, tab)
+    # Match and click the first visible, enabled tab in-page (one round-trip per poll) instead of an XPath translate()
+    js = (
+        "for (const s of document.querySelectorAll('button span, a span')) {"
+        "  if (!s.textContent.replace(/\\s+/g, ' ').trim().toLowerCase().includes(arguments[0])) continue;"
+        # Same guarantee as the old clickable wait: skip hidden (e.g. closed overlay) or disabled tabs
+        "  const el = s.closest('button,a');"
+        "  if (!el || !el.getClientRects().length || el.disabled) continue;"
+        "  el.click();"
+        "  return true;"
+        "}"
+        "return false;"
+    )
+    WebDriverWait(driver, 12).until(lambda d: d.execute_script(js, tab_text_lower))
     time.sleep(CONFIG["DELAY_CLICK"])
     ok(f"Tab opened: {tab_text_lower}")
 
@@ -353,19 +444,18 @@ def scrape_info_text_value(driver, label: str, timeout=15) -> str:
     return WebDriverWait(driver, timeout).until(_non_empty)
 
 def extract_google_map_link(driver) -> str:
-    try:
-        iframe = driver.find_element(By.XPATH, "//iframe[contains(@src,'google.com/maps') or contains(@src,'maps.google.com/maps')]")
-        src = iframe.get_attribute("src") or ""
-        if not src:
-            return ""
-        parsed = urlparse(src)
-        qs = parse_qs(parsed.query)
-        q = (qs.get("q", [""])[0] or "").strip()
-        if q and "," in q:
-            return f"https://maps.google.com/maps?q={q}"
-        return src
-    except Exception:
+    iframes = driver.find_elements(By.XPATH, "//iframe[contains(@src,'google.com/maps') or contains(@src,'maps.google.com/maps')]")
+    if not iframes:
+        return ""
+    src = iframes[0].get_attribute("src") or ""
+    if not src:
         return ""
+    parsed = urlparse(src)
+    qs = parse_qs(parsed.query)
+    q = (qs.get("q", [""])[0] or "").strip()
+    if q and "," in q:
+        return f"https://maps.google.com/maps?q={q}"
+    return src
 
 def extract_status_header_fields(driver):
     """
@@ -376,48 +466,41 @@ def extract_status_header_fields(driver):
     """
     out = {"Maklumat Pembangunan": "", "Status Projek Keseluruhan": ""}
 
-    # 1) Locate the "Status Terkini Projek" section/container
-    scope = None
-    xps = [
+    # 1) Read the "Status Terkini Projek" section/container text in one round-trip
+    raw = driver.execute_script(
+        "for (const xp of arguments) {"
+        "  const el = document.evaluate(xp, document, null, 9, null).singleNodeValue;"
+        "  if (el) return el.textContent;"
+        "}"
+        "return null;",
         # card/container that contains the title
         "//*[contains(normalize-space(.),'Status Terkini Projek')]/ancestor::div[contains(@class,'card')][1]",
         # fallback: nearest big container
         "//*[contains(normalize-space(.),'Status Terkini Projek')]/ancestor::div[1]",
-    ]
-    for xp in xps:
-        try:
-            scope = driver.find_element(By.XPATH, xp)
-            if scope:
-                break
-        except Exception:
-            continue
+    )
 
-    if not scope:
+    if raw is None:
         info("Status Terkini container not found")
         return out
 
-    raw = normalize_space(scope.get_attribute("textContent") or "")
+    raw = normalize_space(raw)
 
     # 2) Regex extract ONLY the value after ":"
-    # Stop capture before the next known label (or end)
-    import re as _re
-
-    m1 = _re.search(r"Maklumat\s*Pembangunan\s*:\s*(.+?)(?:Status\s*Keseluruhan\s*:|$)", raw, _re.IGNORECASE)
-    if m1:
-        val = normalize_space(m1.group(1))
-        # safety: cut off if it still contains table headers
-        val = val.split("Jenis Rumah")[0].strip()
-        out["Maklumat Pembangunan"] = val
-        ok(f"Maklumat Pembangunan = {val}")
+    found = {}
+    for m in _STATUS_RE.finditer(raw):
+        key = "Maklumat Pembangunan" if m.group(1).lower().startswith("maklumat") else "Status Keseluruhan"
+        if key not in found:
+            found[key] = normalize_space(m.group(2))
+
+    if "Maklumat Pembangunan" in found:
+        out["Maklumat Pembangunan"] = found["Maklumat Pembangunan"]
+        ok(f"Maklumat Pembangunan = {out['Maklumat Pembangunan']}")
     else:
         info("Maklumat Pembangunan not found (regex)")
 
-    m2 = _re.search(r"Status\s*Keseluruhan\s*:\s*(.+?)(?:Status\s*komponen|Jenis\s*Rumah|$)", raw, _re.IGNORECASE)
-    if m2:
-        val = normalize_space(m2.group(1))
-        val = val.split("Jenis Rumah")[0].strip()
-        out["Status Projek Keseluruhan"] = val
-        ok(f"Status Keseluruhan = {val}")
+    if "Status Keseluruhan" in found:
+        out["Status Projek Keseluruhan"] = found["Status Keseluruhan"]
+        ok(f"Status Keseluruhan = {out['Status Projek Keseluruhan']}")
     else:
         info("Status Keseluruhan not found (regex)")
 
@@ -427,30 +510,30 @@ def extract_status_header_fields(driver):
 
 def extract_status_table_rows(driver):
     rows_out = []
+    table_css = "table.table-status"
     try:
-        table = wait_visible(driver, (By.XPATH, "//table[contains(@class,'table-status')]"), timeout=15)
+        wait_visible(driver, (By.CSS_SELECTOR, table_css), timeout=15)
     except Exception:
-        table = wait_visible(driver, (By.XPATH, "//div[contains(@class,'status-table-wrap')]//table"), timeout=15)
+        table_css = "div.status-table-wrap table"
+        wait_visible(driver, (By.CSS_SELECTOR, table_css), timeout=15)
 
-    trs = table.find_elements(By.XPATH, ".//tbody//tr")
-    for tr in trs:
-        tds = tr.find_elements(By.XPATH, ".//td")
+    for tds in scrape_table_fast(driver, table_css, 12):
         if len(tds) < 12:
             continue
 
         rows_out.append({
-            "Jenis Rumah": normalize_space(tds[0].text),
-            "Bil Tingkat": normalize_space(tds[1].text),
-            "Bil Bilik": normalize_space(tds[2].text),
-            "Bil Tandas": normalize_space(tds[3].text),
-            "Keluasan Binaan (Mps)": normalize_space(tds[4].text),
-            "Bil.Unit": normalize_space(tds[5].text),
-            "Harga Minimum (RM)": normalize_space(tds[6].text),
-            "Harga Maksimum (RM)": normalize_space(tds[7].text),
-            "Peratus Sebenar %": normalize_space(tds[8].text),
-            "Status Komponen": normalize_space(tds[9].text),
-            "Tarikh CCC/CFO": normalize_space(tds[10].text),
-            "Tarikh VP": normalize_space(tds[11].text),
+            "Jenis Rumah": tds[0],
+            "Bil Tingkat": tds[1],
+            "Bil Bilik": tds[2],
+            "Bil Tandas": tds[3],
+            "Keluasan Binaan (Mps)": tds[4],
+            "Bil.Unit": tds[5],
+            "Harga Minimum (RM)": tds[6],
+            "Harga Maksimum (RM)": tds[7],
+            "Peratus Sebenar %": tds[8],
+            "Status Komponen": tds[9],
+            "Tarikh CCC/CFO": tds[10],
+            "Tarikh VP": tds[11],
         })
 
     return rows_out
@@ -483,45 +566,59 @@ def ensure_paparan_senarai(driver):
 
 def scrape_unit_table(driver):
     rows_out = []
-    table = wait_visible(driver, (By.XPATH, "//table[contains(@class,'unit-list-table')]"), timeout=15)
+    table_css = "table.unit-list-table"
+    wait_visible(driver, (By.CSS_SELECTOR, table_css), timeout=15)
 
-    trs = table.find_elements(By.XPATH, ".//tbody//tr")
-    for tr in trs:
-        tds = tr.find_elements(By.XPATH, ".//td")
+    for tds in scrape_table_fast(driver, table_css, 7):
         if len(tds) < 7:
             continue
         rows_out.append({
-            "Bil": normalize_space(tds[0].get_attribute("textContent") or ""),
-            "No PT/Lot/Plot": normalize_space(tds[1].get_attribute("textContent") or ""),
-            "No Unit": normalize_space(tds[2].get_attribute("textContent") or ""),
-            "Harga Jualan (RM)": normalize_space(tds[3].get_attribute("textContent") or ""),
-            "Harga SPJB (RM)": normalize_space(tds[4].get_attribute("textContent") or ""),
-            "Status Jualan": normalize_space(tds[5].get_attribute("textContent") or ""),
-            "Kuota Bumi": normalize_space(tds[6].get_attribute("textContent") or ""),
+            "Bil": tds[0],
+            "No PT/Lot/Plot": tds[1],
+            "No Unit": tds[2],
+            "Harga Jualan (RM)": tds[3],
+            "Harga SPJB (RM)": tds[4],
+            "Status Jualan": tds[5],
+            "Kuota Bumi": tds[6],
         })
     ok(f"Unit rows scraped = {len(rows_out)}")
     return rows_out
 
 def close_unit_modal(driver):
-    try:
-        btn = driver.find_element(By.XPATH, "//button[contains(.,'TUTUP') or contains(.,'Tutup')]")
-        safe_click(driver, btn)
-        ok("Unit modal closed (TUTUP)")
-    except Exception:
+    btns = driver.find_elements(By.XPATH, "//button[contains(.,'TUTUP') or contains(.,'Tutup')]")
+    if not btns:
         info("Unit modal close not found")
+        return
+    safe_click(driver, btns[0])
+    ok("Unit modal closed (TUTUP)")
 
 
 # =========================================================
-# CSV WRITERS
+# PARQUET WRITERS
 # =========================================================
-def write_csv(path, headers, rows):
+def parquet_schema(headers):
+    # All columns are text
+    return pa.schema([(h, pa.string()) for h in headers])
+
+def open_parquet_writer(path, headers):
     ensure_dir(os.path.dirname(path))
-    with open(path, "w", newline="", encoding="utf-8-sig") as f:
-        w = csv.DictWriter(f, fieldnames=headers)
-        w.writeheader()
-        for r in rows:
-            w.writerow({h: r.get(h, "") for h in headers})
-    ok(f"Saved CSV: {path}")
+    return pq.ParquetWriter(path, parquet_schema(headers), compression="snappy")
+
+def write_parquet_rows(writer, rows):
+    # Blank cells are stored as nulls
+    schema = writer.schema
+    table = pa.Table.from_pylist(rows, schema=schema)
+    table = pa.table([pc.if_else(pc.equal(col, ""), None, col) for col in table.columns], schema=schema)
+    writer.write_table(table)
+    return len(rows)
+
+def flush_parquet_rows(writer, rows, min_rows=0):
+    # Every write_table call starts a new row group, so only write once enough rows are buffered
+    if not rows or len(rows) < min_rows:
+        return 0
+    n = write_parquet_rows(writer, rows)
+    rows.clear()
+    return n
 
 
 # =========================================================
@@ -536,7 +633,7 @@ def split_kod_nama(kod_proj_nama: str):
     nama = " ".join(parts[1:]) if len(parts) > 1 else ""
     return kod, nama
 
-def scrape_one_pemaju(pemaju_name: str):
+def scrape_one_pemaju(pemaju_name: str, driver=None):
     pemaju_key = sanitize_filename(pemaju_name)
     root = CONFIG["ROOT_DIR"]
     data_dir = os.path.join(root, "data", "pemaju", pemaju_key)
@@ -546,17 +643,28 @@ def scrape_one_pemaju(pemaju_name: str):
     ok(f"Start Pemaju: {pemaju_name}")
     ok(f"Output folder: {data_dir}")
 
-    project_master_csv = os.path.join(data_dir, f"{pemaju_key}_MELAKA_ALL_PROJECTS_{DATE_SUFFIX}.csv")
-    house_type_csv = os.path.join(data_dir, f"{pemaju_key}_MELAKA_HOUSE_TYPE_{DATE_SUFFIX}.csv")
-    unit_details_csv = os.path.join(data_dir, f"{pemaju_key}_MELAKA_UNIT_DETAILS_{DATE_SUFFIX}.csv")
+    project_master_parquet = os.path.join(data_dir, f"{pemaju_key}_MELAKA_ALL_PROJECTS_{DATE_SUFFIX}.parquet")
+    house_type_parquet = os.path.join(data_dir, f"{pemaju_key}_MELAKA_HOUSE_TYPE_{DATE_SUFFIX}.parquet")
+    unit_details_parquet = os.path.join(data_dir, f"{pemaju_key}_MELAKA_UNIT_DETAILS_{DATE_SUFFIX}.parquet")
 
-    driver = None
+    driver_failed = False
+    # Rows are buffered and streamed to disk in PARQUET_FLUSH_ROWS batches
+    pm_writer = ht_writer = unit_writer = None
     project_master_rows = []
     house_type_rows = []
     unit_detail_rows = []
+    n_projects = n_house_types = n_units = 0
+    flush_rows = CONFIG["PARQUET_FLUSH_ROWS"]
 
     try:
-        driver = init_driver()
+        # Started here (not by the caller) so a Chrome start failure lands in this pemaju's log
+        if driver is None:
+            driver = init_driver()
+
+        pm_writer = open_parquet_writer(project_master_parquet, PROJECT_MASTER_HEADERS)
+        ht_writer = open_parquet_writer(house_type_parquet, HOUSE_TYPE_HEADERS)
+        unit_writer = open_parquet_writer(unit_details_parquet, UNIT_DETAILS_HEADERS)
+
         perform_search(driver, pemaju_name)
 
         bil_project = 1
@@ -569,19 +677,20 @@ def scrape_one_pemaju(pemaju_name: str):
             if not rows:
                 info("No listing rows found. Stop.")
                 break
+            # Snapshot the listing text once per page, before any detail overlay is opened
+            listing = scrape_table_fast(driver, "table:has(tbody tr)", 5)
 
-            for idx in range(len(rows)):
-                rows = get_listing_rows(driver)  # refresh avoid stale
+            for idx in range(len(listing)):
                 if idx >= len(rows):
                     continue
 
                 row = rows[idx]
-                cells = row.find_elements(By.XPATH, ".//td")
+                cells = listing[idx]
 
-                kod_proj_nama = normalize_space(cells[1].get_attribute("textContent") or "") if len(cells) > 1 else ""
-                kod_pemaju_nama = normalize_space(cells[2].get_attribute("textContent") or "") if len(cells) > 2 else ""
-                no_permit = normalize_space(cells[3].get_attribute("textContent") or "") if len(cells) > 3 else ""
-                status_list = normalize_space(cells[4].get_attribute("textContent") or "") if len(cells) > 4 else ""
+                kod_proj_nama = cells[1] if len(cells) > 1 else ""
+                kod_pemaju_nama = cells[2] if len(cells) > 2 else ""
+                no_permit = cells[3] if len(cells) > 3 else ""
+                status_list = cells[4] if len(cells) > 4 else ""
 
                 ok(f"[{bil_project}] Open: {kod_proj_nama}")
 
@@ -635,11 +744,14 @@ def scrape_one_pemaju(pemaju_name: str):
                 except Exception as e:
                     fail(f"Status Terkini extract failed: {e}")
 
+                kod_projek, nama_projek = split_kod_nama(kod_proj_nama)
+
                 # PROJECT_MASTER row (no table columns inside)
                 pm = {h: "" for h in PROJECT_MASTER_HEADERS}
                 pm.update({
                     "Bil": str(bil_project),
-                    "Kod Projek & Nama Projek": kod_proj_nama,
+                    "Kod Projek": kod_projek,
+                    "Nama Projek": nama_projek,
                     "Kod Pemaju & Nama Pemaju": kod_pemaju_nama,
                     "No. Permit": no_permit,
                     "Status Projek Keseluruhan": status_overall,
@@ -654,7 +766,6 @@ def scrape_one_pemaju(pemaju_name: str):
                 project_master_rows.append(pm)
 
                 # HOUSE TYPE rows (all status rows)
-                kod_projek, nama_projek = split_kod_nama(kod_proj_nama)
                 for srow in status_rows:
                     ht = {h: "" for h in HOUSE_TYPE_HEADERS}
                     ht.update({
@@ -688,7 +799,8 @@ def scrape_one_pemaju(pemaju_name: str):
                         out = {h: "" for h in UNIT_DETAILS_HEADERS}
                         out.update({
                             "Bil": str(bil_unit_global),
-                            "Kod Projek & Nama Projek": kod_proj_nama,
+                            "Kod Projek": kod_projek,
+                            "Nama Projek": nama_projek,
                             "Kod Pemaju & Nama Pemaju": kod_pemaju_nama,
                             "No. Permit": no_permit,
 
@@ -715,43 +827,90 @@ def scrape_one_pemaju(pemaju_name: str):
                         pass
 
                 close_project_detail(driver)
+                # The detail is an overlay, so the rows usually survive; re-fetch only if they went stale
+                try:
+                    rows[0].is_enabled()
+                except StaleElementReferenceException:
+                    rows = get_listing_rows(driver)
                 bil_project += 1
 
+                n_projects += flush_parquet_rows(pm_writer, project_master_rows, flush_rows)
+                n_house_types += flush_parquet_rows(ht_writer, house_type_rows, flush_rows)
+                n_units += flush_parquet_rows(unit_writer, unit_detail_rows, flush_rows)
+
             # pagination
-            if has_next_page(driver):
-                click_next_page(driver)
+            if paginate(driver):
                 page_num += 1
             else:
                 ok("No next page. Pagination done.")
                 break
 
-        # WRITE OUTPUTS
-        write_csv(project_master_csv, PROJECT_MASTER_HEADERS, project_master_rows)
-        write_csv(house_type_csv, HOUSE_TYPE_HEADERS, house_type_rows)
-        write_csv(unit_details_csv, UNIT_DETAILS_HEADERS, unit_detail_rows)
+        n_projects += flush_parquet_rows(pm_writer, project_master_rows)
+        n_house_types += flush_parquet_rows(ht_writer, house_type_rows)
+        n_units += flush_parquet_rows(unit_writer, unit_detail_rows)
 
-        ok(f"SUMMARY: Projects={len(project_master_rows)}, HouseTypes={len(house_type_rows)}, UnitRows={len(unit_detail_rows)}")
+        ok(f"SUMMARY: Projects={n_projects}, HouseTypes={n_house_types}, UnitRows={n_units}")
         ok("DONE pemaju scrape")
 
     except Exception as e:
         fail(f"Fatal pemaju scrape error: {e}")
         logging.exception(e)
+        # Timeouts and missing elements leave the session usable; only a dead browser is replaced
+        driver_failed = driver is None or isinstance(e, InvalidSessionIdException) or not driver_alive(driver)
     finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception:
-                pass
-            ok("Chrome driver closed")
+        # Flush and close even on a fatal error so the rows scraped so far stay readable
+        for path, writer, pending in (
+            (project_master_parquet, pm_writer, project_master_rows),
+            (house_type_parquet, ht_writer, house_type_rows),
+            (unit_details_parquet, unit_writer, unit_detail_rows),
+        ):
+            if writer:
+                try:
+                    flush_parquet_rows(writer, pending)
+                finally:
+                    writer.close()
+                ok(f"Saved Parquet: {path}")
 
     return {
         "pemaju": pemaju_name,
-        "project_master_csv": project_master_csv,
-        "house_type_csv": house_type_csv,
-        "unit_details_csv": unit_details_csv,
+        "project_master_parquet": project_master_parquet,
+        "house_type_parquet": house_type_parquet,
+        "unit_details_parquet": unit_details_parquet,
         "log_file": log_file,
+        "driver": driver,
+        "driver_failed": driver_failed,
     }
 
+def driver_alive(driver):
+    try:
+        return driver.execute_script("return 1;") == 1
+    except WebDriverException:
+        return False
+
+def quit_driver(driver):
+    if driver:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        ok("Chrome driver closed")
+
+def scrape_pemaju_batch(pemaju_names):
+    # One Chrome per worker, reused across its pemajus and replaced only after a WebDriver failure
+    results = []
+    driver = None
+    try:
+        for pemaju_name in pemaju_names:
+            res = scrape_one_pemaju(pemaju_name, driver)
+            driver = res.pop("driver")
+            if res.pop("driver_failed"):
+                quit_driver(driver)
+                driver = None
+            results.append(res)
+    finally:
+        quit_driver(driver)
+    return results
+
 
 # =========================================================
 # READ PEMAJU LIST & RUN
@@ -770,12 +929,14 @@ def read_pemaju_list(txt_path: str):
 
 def main():
     # ---------------------------------------------------------------
-    # 🧹 NEW CLEANUP BLOCK: DELETES OLD CSVS BEFORE STARTING
+    # 🧹 NEW CLEANUP BLOCK: DELETES OLD OUTPUTS BEFORE STARTING
     # ---------------------------------------------------------------
-    print("🧹 Starting Cleanup: Deleting old CSV files...")
-    # This finds ALL .csv files in your data folder and subfolders
+    print("🧹 Starting Cleanup: Deleting old output files...")
+    # This finds ALL .parquet (and legacy .csv) files in your data folder and subfolders
     # Using recursive=True to get inside /data/pemaju/...
-    files_to_delete = glob.glob(os.path.join(CONFIG["ROOT_DIR"], "data", "**", "*.csv"), recursive=True)
+    files_to_delete = []
+    for ext in ("*.parquet", "*.csv"):
+        files_to_delete += glob.glob(os.path.join(CONFIG["ROOT_DIR"], "data", "**", ext), recursive=True)
     
     for f in files_to_delete:
         try:
@@ -794,17 +955,22 @@ def main():
     ensure_dir(os.path.join(CONFIG["ROOT_DIR"], "data"))
     ensure_dir(os.path.join(CONFIG["ROOT_DIR"], "logs"))
 
-    for i, pemaju in enumerate(pemaju_list, 1):
-        print(f"\n=== ({i}/{len(pemaju_list)}) SCRAPING: {pemaju} ===")
-        res = scrape_one_pemaju(pemaju)
-        results.append(res)
+    # Pemajus are independent; each worker keeps one Chrome for its share and logs per pemaju
+    workers = max(1, min(CONFIG["WORKERS"], len(pemaju_list)))
+    batches = [pemaju_list[i::workers] for i in range(workers)]
+    chromedriver_path = resolve_chromedriver_path()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(NOW, chromedriver_path)) as ex:
+        for batch_results in ex.map(scrape_pemaju_batch, batches):
+            for res in batch_results:
+                results.append(res)
+                print(f"\n=== ({len(results)}/{len(pemaju_list)}) FINISHED: {res['pemaju']} ===")
 
     print("\nALL DONE.")
     for r in results:
         print(f"- {r['pemaju']}")
-        print(f"  Master: {r['project_master_csv']}")
-        print(f"  House : {r['house_type_csv']}")
-        print(f"  Units : {r['unit_details_csv']}")
+        print(f"  Master: {r['project_master_parquet']}")
+        print(f"  House : {r['house_type_parquet']}")
+        print(f"  Units : {r['unit_details_parquet']}")
         print(f"  Log   : {r['log_file']}")
         print()
 